@@ -1,29 +1,113 @@
 import json
+import logging
 import os
+import pickle
+import re
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional
-import logging
-import time
 
-#Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='fitness_tracker.log'
-)
+#orjson is an optional, faster drop-in parser for the exercise database
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+def configure_logging(filename: str = 'fitness_tracker.log'):
+    """
+    Send log records to the log file.
+    The file is only opened once the first record is written.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler(filename, delay=True)]
+    )
+
+#Plain decimal number, e.g. "72" or "72.5"
+_NUMBER_RE = re.compile(r'^\d+(?:\.\d+)?$')
+
+_INTENSITY_MULTIPLIERS = {"low": 0.8, "medium": 1.0, "high": 1.2}
+#A heart rate above each threshold bumps the calorie factor to the next step
+_HEART_RATE_THRESHOLDS = (120, 140, 160)
+_HEART_RATE_FACTORS = (1.0, 1.1, 1.2, 1.3)
+
+#Keep a pickled copy of the parsed database next to the JSON file so later runs skip parsing.
+#Off by default so importing the module never writes files; main() turns it on.
+_DB_PICKLE_CACHE = False
+
+@lru_cache(maxsize=1)
+def _load_db(path: str = 'exercise_database.json') -> Dict:
+    """Load the exercise database once and reuse the parsed data on later calls."""
+    cache_path = os.path.splitext(path)[0] + '.pkl'
+    if _DB_PICKLE_CACHE:
+        #The sidecar is only trusted while the JSON's modification time and size match exactly
+        source = os.stat(path)
+        source_key = (source.st_mtime_ns, source.st_size)
+        try:
+            with open(cache_path, 'rb') as file:
+                cached = pickle.load(file)
+            if cached['source'] == source_key:
+                return cached['data']
+        except Exception:
+            #Missing, stale-format or corrupt sidecar: reparse the JSON and rewrite it
+            pass
+
+    with open(path, 'rb') as file:
+        data = _json.loads(file.read())
+
+    if _DB_PICKLE_CACHE:
+        try:
+            _atomic_pickle_dump({'source': source_key, 'data': data}, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write exercise database cache: {e}")
+    return data
+
+@lru_cache(maxsize=1)
+def _exercise_index(path: str = 'exercise_database.json') -> Dict:
+    """Map case-folded exercise names to their (muscle group, record) pair."""
+    index = {}
+    for group, exercises in _load_db(path).items():
+        for e in exercises:
+            index.setdefault(sys.intern(e['name'].casefold()), (sys.intern(group), e))
+    return index
+
+@lru_cache(maxsize=1)
+def _calorie_columns(path: str = 'exercise_database.json') -> Dict[str, tuple]:
+    """
+    Per muscle group, parallel (records, calories per minute, equipment set)
+    columns ranked from highest to lowest calorie burn.
+    """
+    columns = {}
+    for group, exercises in _load_db(path).items():
+        ranked = sorted(exercises, key=lambda e: e['calories_burned_per_minute'], reverse=True)
+        columns[group] = (ranked,
+                          [e['calories_burned_per_minute'] for e in ranked],
+                          [frozenset(e.get('equipment_needed') or ()) for e in ranked])
+    return columns
 
 class Exercise:
     """
     Represents a single exercise with its properties and methods.
     """
+    __slots__ = ('name', 'muscle_group', 'duration', 'calories_burned_per_minute',
+                 'intensity', 'equipment_needed')
+
     def __init__(self, name: str, muscle_group: str, duration: int, 
                  calories_burned_per_minute: float, intensity: str = "medium",
                  equipment_needed: List[str] = None):
         self.name = name
-        self.muscle_group = muscle_group
+        #Interned so set building and multiplier lookups compare by identity;
+        #anything that isn't a str is left for validate() to judge
+        self.muscle_group = sys.intern(muscle_group) if isinstance(muscle_group, str) else muscle_group
         self.duration = duration
         self.calories_burned_per_minute = calories_burned_per_minute
-        self.intensity = intensity
+        self.intensity = sys.intern(intensity) if isinstance(intensity, str) else intensity
         self.equipment_needed = equipment_needed or []
         self.validate()
 
@@ -33,39 +117,105 @@ class Exercise:
             raise ValueError("Duration must be positive")
         if self.calories_burned_per_minute <= 0:
             raise ValueError("Calories burned must be positive")
-        if self.intensity not in ["low", "medium", "high"]:
+        if self.intensity not in _INTENSITY_MULTIPLIERS:
             raise ValueError("Invalid intensity level")
 
     def calculate_calories_burned(self, weight: float, heart_rate: Optional[int] = None) -> float:
         """Calculate calories burned considering weight and optional heart rate."""
-        weight_factor = weight / 70
+        return self._calories_burned(weight / 70, heart_rate)
+
+    def _calories_burned(self, weight_factor: float, heart_rate: Optional[int] = None) -> float:
+        """Calculate calories burned from a precomputed weight factor (weight / 70)."""
         base_calories = self.duration * self.calories_burned_per_minute * weight_factor
 
-        intensity_multipliers = {"low": 0.8, "medium": 1.0, "high": 1.2}
-        intensity_factor = intensity_multipliers[self.intensity]
+        intensity_factor = _INTENSITY_MULTIPLIERS[self.intensity]
 
         heart_rate_factor = 1.0
         if heart_rate:
-            if heart_rate > 160:
-                heart_rate_factor = 1.3
-            elif heart_rate > 140:
-                heart_rate_factor = 1.2
-            elif heart_rate > 120:
-                heart_rate_factor = 1.1
+            heart_rate_factor = _HEART_RATE_FACTORS[bisect_left(_HEART_RATE_THRESHOLDS, heart_rate)]
 
         return base_calories * intensity_factor * heart_rate_factor
 
+    def to_dict(self) -> Dict:
+        """Plain-data copy of the exercise, as keyword arguments for Exercise(...)."""
+        return {
+            "name": self.name,
+            "muscle_group": self.muscle_group,
+            "duration": self.duration,
+            "calories_burned_per_minute": self.calories_burned_per_minute,
+            "intensity": self.intensity,
+            "equipment_needed": list(self.equipment_needed)
+        }
+
 class Workout:
     """
     Represents a complete workout session with multiple exercises.
     """
+    __slots__ = ('exercises', '_date', '_date_str', '_notes', '_total_duration',
+                 '_total_calories_burned', 'heart_rate_log', '_heart_rate_sum',
+                 '_muscle_groups', '_equipment_used', '_summary_cache',
+                 '_exercise_lines_cache')
+
     def __init__(self):
         self.exercises = []
         self.date = datetime.now()
-        self.notes = ""
+        self._notes = ""
         self._total_duration = 0
         self._total_calories_burned = 0
         self.heart_rate_log = []
+        self._heart_rate_sum = 0
+        #Maintained as exercises are added so the summary never rescans them
+        self._muscle_groups = set()
+        self._equipment_used = set()
+        self._summary_cache = None
+        self._exercise_lines_cache = None
+
+    def to_dict(self) -> Dict:
+        """Plain-data copy of the workout for saving; derived sets and caches are rebuilt on load."""
+        return {
+            "date": self.date,
+            "notes": self.notes,
+            "exercises": [e.to_dict() for e in self.exercises],
+            "total_calories": self._total_calories_burned,
+            "heart_rate_log": list(self.heart_rate_log)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Workout":
+        """Rebuild a workout saved with to_dict."""
+        workout = cls()
+        workout.date = data["date"]
+        workout.notes = data["notes"]
+        for fields in data["exercises"]:
+            exercise = Exercise(**fields)
+            workout.exercises.append(exercise)
+            workout._total_duration += exercise.duration
+            workout._muscle_groups.add(exercise.muscle_group)
+            workout._equipment_used.update(exercise.equipment_needed)
+        #Calories depend on the weight and heart rates at logging time, so they are kept as saved
+        workout._total_calories_burned = data["total_calories"]
+        workout.heart_rate_log = list(data["heart_rate_log"])
+        workout._heart_rate_sum = sum(workout.heart_rate_log)
+        return workout
+
+    @property
+    def date(self) -> datetime:
+        return self._date
+
+    @date.setter
+    def date(self, value: datetime):
+        self._date = value
+        self._date_str = value.strftime("%Y-%m-%d %H:%M")
+        self._summary_cache = None
+
+    @property
+    def notes(self) -> str:
+        return self._notes
+
+    @notes.setter
+    def notes(self, value: str):
+        self._notes = value
+        self._summary_cache = None
 
     def add_exercise(self, exercise: Exercise, user_weight: float, heart_rate: Optional[int] = None):
         """Adding an exercise to the workout with heart rate tracking."""
@@ -73,36 +223,82 @@ class Workout:
         self._total_duration += exercise.duration
         calories = exercise.calculate_calories_burned(user_weight, heart_rate)
         self._total_calories_burned += calories
+        self._muscle_groups.add(exercise.muscle_group)
+        self._equipment_used.update(exercise.equipment_needed)
+        self._summary_cache = None
+        self._exercise_lines_cache = None
         
         if heart_rate:
             self.heart_rate_log.append(heart_rate)
+            self._heart_rate_sum += heart_rate
             logging.info(f"Exercise added: {exercise.name} - Heart rate: {heart_rate}")
 
+    def add_exercises(self, exercises: List[Exercise], user_weight: float):
+        """Add a batch of exercises without heart rate data, e.g. from an imported history."""
+        self.exercises.extend(exercises)
+        self._total_duration += sum(e.duration for e in exercises)
+        weight_factor = user_weight / 70
+        self._total_calories_burned += sum(e._calories_burned(weight_factor) for e in exercises)
+        for e in exercises:
+            self._muscle_groups.add(e.muscle_group)
+            self._equipment_used.update(e.equipment_needed)
+        self._summary_cache = None
+        self._exercise_lines_cache = None
+
     def get_workout_summary(self) -> Dict:
-        """Generating a detailed summary of the workout."""
-        muscle_groups_worked = set(e.muscle_group for e in self.exercises)
-        equipment_used = set(item for e in self.exercises 
-                           for item in (e.equipment_needed or []))
-        
-        avg_heart_rate = None
-        if self.heart_rate_log:
-            avg_heart_rate = sum(self.heart_rate_log) / len(self.heart_rate_log)
-        
-        return {
-            "date": self.date.strftime("%Y-%m-%d %H:%M"),
-            "total_duration": self._total_duration,
-            "total_calories": self._total_calories_burned,
-            "exercise_count": len(self.exercises),
-            "muscle_groups": list(muscle_groups_worked),
-            "equipment_used": list(equipment_used),
-            "average_heart_rate": avg_heart_rate,
-            "notes": self.notes
-        }
+        """
+        Generating a detailed summary of the workout.
+        The scalar fields are cached until the workout changes; each call
+        returns a fresh dict with its own lists.
+        """
+        if self._summary_cache is None:
+            avg_heart_rate = None
+            if self.heart_rate_log:
+                avg_heart_rate = self._heart_rate_sum / len(self.heart_rate_log)
+
+            self._summary_cache = {
+                "date": self._date_str,
+                "total_duration": self._total_duration,
+                "total_calories": self._total_calories_burned,
+                "exercise_count": len(self.exercises),
+                "muscle_groups": None,
+                "equipment_used": None,
+                "average_heart_rate": avg_heart_rate,
+                "notes": self.notes
+            }
+
+        summary = dict(self._summary_cache)
+        summary["muscle_groups"] = list(self._muscle_groups)
+        summary["equipment_used"] = list(self._equipment_used)
+        return summary
+
+    def _exercise_lines(self) -> List[str]:
+        """Formatted exercise lines for the detailed history view (cached until the workout changes)."""
+        if self._exercise_lines_cache is None:
+            lines = []
+            add_line = lines.append
+            for exercise in self.exercises:
+                equipment = exercise.equipment_needed
+                add_line(f"- {exercise.name} ({exercise.muscle_group})")
+                add_line(f"  Duration: {exercise.duration} min")
+                add_line(f"  Intensity: {exercise.intensity}")
+                if equipment:
+                    add_line(f"  Equipment: {', '.join(equipment)}")
+            self._exercise_lines_cache = lines
+        return self._exercise_lines_cache
+
+def _plain_duration(value: float):
+    """Give back a whole-number duration from the float column as an int, e.g. 10.0 -> 10."""
+    return int(value) if value.is_integer() else value
 
 class User:
     """
     Represents a user of the fitness tracking system.
     """
+    __slots__ = ('name', 'weight', 'height', 'age', 'fitness_level',
+                 'workouts', 'goals', '_workout_durations', '_workout_calories',
+                 '_cumulative_calories', '_cumulative_duration')
+
     def __init__(self, name: str, weight: float, height: float = None, 
                  age: int = None, fitness_level: str = "intermediate"):
         self.name = name
@@ -112,26 +308,71 @@ class User:
         self.fitness_level = fitness_level
         self.workouts = []
         self.goals = {}
-        self.progress_history = []
+        #Per-workout totals kept as compact numeric columns, parallel to self.workouts;
+        #they double as the progress history
+        self._workout_durations = array('d')
+        self._workout_calories = array('d')
+        self._cumulative_calories = 0.0
+        self._cumulative_duration = 0
         
         logging.info(f"New user created: {name}")
 
     def add_workout(self, workout: Workout):
         """Add a completed workout to user's history."""
+        #Columns first, so a bad value can't leave them out of step with self.workouts
+        self._workout_durations.append(workout._total_duration)
+        self._workout_calories.append(workout._total_calories_burned)
         self.workouts.append(workout)
-        self._update_progress_history(workout)
+        self._cumulative_calories += workout._total_calories_burned
+        self._cumulative_duration += workout._total_duration
         self._check_goals(workout)
         
         logging.info(f"Workout added for {self.name}")
 
-    def _update_progress_history(self, workout: Workout):
-        """Track user's progress over time."""
-        progress = {
-            "date": workout.date,
-            "calories": workout.get_workout_summary()["total_calories"],
-            "duration": workout.get_workout_summary()["total_duration"]
+    @property
+    def progress_history(self) -> List[Dict]:
+        """
+        User's progress over time, one entry per logged workout.
+        Read-only: the list is rebuilt from the stored columns on each access.
+        """
+        return [
+            {"date": w.date, "calories": calories, "duration": _plain_duration(duration)}
+            for w, calories, duration in zip(self.workouts, self._workout_calories,
+                                             self._workout_durations)
+        ]
+
+    def to_dict(self) -> Dict:
+        """Plain-data copy of the profile and its history for saving."""
+        return {
+            "name": self.name,
+            "weight": self.weight,
+            "height": self.height,
+            "age": self.age,
+            "fitness_level": self.fitness_level,
+            "goals": {goal_type: dict(goal) for goal_type, goal in self.goals.items()},
+            "workouts": [w.to_dict() for w in self.workouts],
+            "workout_durations": list(self._workout_durations),
+            "workout_calories": list(self._workout_calories)
         }
-        self.progress_history.append(progress)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "User":
+        """Rebuild a profile saved with to_dict, without logging it as a new user."""
+        user = cls.__new__(cls)
+        user.name = data["name"]
+        user.weight = data["weight"]
+        user.height = data["height"]
+        user.age = data["age"]
+        user.fitness_level = data["fitness_level"]
+        user.goals = {goal_type: dict(goal) for goal_type, goal in data["goals"].items()}
+        user.workouts = [Workout.from_dict(w) for w in data["workouts"]]
+        user._workout_durations = array('d', data["workout_durations"])
+        user._workout_calories = array('d', data["workout_calories"])
+        if not len(user.workouts) == len(user._workout_durations) == len(user._workout_calories):
+            raise ValueError(f"Saved history for {user.name} is out of step")
+        user._cumulative_calories = sum(user._workout_calories)
+        user._cumulative_duration = sum(user._workout_durations)
+        return user
 
     def set_goal(self, goal_type: str, target: float, deadline: datetime.now().date()):
         """Set a fitness goal for the user."""
@@ -146,7 +387,7 @@ class User:
     def _get_current_value(self, goal_type: str) -> float:
         """Calculate current value for a given goal type."""
         if goal_type == "calories":
-            return sum(w.get_workout_summary()["total_calories"] for w in self.workouts)
+            return self._cumulative_calories
         elif goal_type == "workouts":
             return len(self.workouts)
         return 0
@@ -165,59 +406,62 @@ class User:
             print(f"No workouts logged for {self.name}")
             return
 
-        print(f"\nWorkout History for {self.name}")
-        print(f"Weight: {self.weight} kg | Fitness Level: {self.fitness_level}")
+        lines = [f"\nWorkout History for {self.name}"]
+        add_line = lines.append
+        add_line(f"Weight: {self.weight} kg | Fitness Level: {self.fitness_level}")
         
-        total_calories = sum(w.get_workout_summary()["total_calories"] for w in self.workouts)
-        total_duration = sum(w.get_workout_summary()["total_duration"] for w in self.workouts)
+        #Summed from the live workout totals so the footer matches the lines above,
+        #even if a workout gained exercises after it was added
+        total_calories = 0
+        total_duration = 0
         
         for i, workout in enumerate(self.workouts, 1):
-            summary = workout.get_workout_summary()
-            print(f"\nWorkout #{i} - {summary['date']}")
-            print(f"Duration: {summary['total_duration']} minutes")
-            print(f"Calories: {summary['total_calories']:.2f}")
+            total_calories += workout._total_calories_burned
+            total_duration += workout._total_duration
+            add_line(f"\nWorkout #{i} - {workout._date_str}")
+            add_line(f"Duration: {workout._total_duration} minutes")
+            add_line(f"Calories: {workout._total_calories_burned:.2f}")
             
             if detailed:
-                print("Exercises:")
-                for exercise in workout.exercises:
-                    print(f"- {exercise.name} ({exercise.muscle_group})")
-                    print(f"  Duration: {exercise.duration} min")
-                    print(f"  Intensity: {exercise.intensity}")
-                    if exercise.equipment_needed:
-                        print(f"  Equipment: {', '.join(exercise.equipment_needed)}")
-
-        print(f"\nTotal Statistics:")
-        print(f"Total Workouts: {len(self.workouts)}")
-        print(f"Total Duration: {total_duration} minutes")
-        print(f"Total Calories: {total_calories:.2f}")
+                add_line("Exercises:")
+                lines.extend(workout._exercise_lines())
+
+        add_line(f"\nTotal Statistics:")
+        add_line(f"Total Workouts: {len(self.workouts)}")
+        add_line(f"Total Duration: {total_duration} minutes")
+        add_line(f"Total Calories: {total_calories:.2f}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def view_progress(self):
         """Display user's progress in a text-based format."""
-        if not self.progress_history:
+        if not self.workouts:
             print("Not enough data for progress report")
             return
 
-        print(f"\nProgress Report for {self.name}")
-        print("-" * 40)
+        lines = [f"\nProgress Report for {self.name}", "-" * 40]
+        add_line = lines.append
         
         # Calculate trends
-        calories_trend = [p["calories"] for p in self.progress_history]
-        duration_trend = [p["duration"] for p in self.progress_history]
+        calories_trend = self._workout_calories
+        duration_trend = self._workout_durations
         
-        print("Calories Burned Trend:")
+        add_line("Calories Burned Trend:")
         for i, calories in enumerate(calories_trend):
-            print(f"Workout {i+1}: {calories:.1f} calories")
+            add_line(f"Workout {i+1}: {calories:.1f} calories")
         
-        print("\nWorkout Duration Trend:")
+        add_line("\nWorkout Duration Trend:")
         for i, duration in enumerate(duration_trend):
-            print(f"Workout {i+1}: {duration} minutes")
+            add_line(f"Workout {i+1}: {_plain_duration(duration)} minutes")
         
         # Calculate averages
-        avg_calories = sum(calories_trend) / len(calories_trend)
-        avg_duration = sum(duration_trend) / len(duration_trend)
+        avg_calories = self._cumulative_calories / len(calories_trend)
+        avg_duration = self._cumulative_duration / len(duration_trend)
         
-        print(f"\nAverage calories per workout: {avg_calories:.1f}")
-        print(f"Average duration per workout: {avg_duration:.1f} minutes")
+        add_line(f"\nAverage calories per workout: {avg_calories:.1f}")
+        add_line(f"Average duration per workout: {avg_duration:.1f} minutes")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def clear_screen(pause: bool = False):
     """
@@ -226,7 +470,49 @@ def clear_screen(pause: bool = False):
     """
     if pause:
         input("\nPress Enter to continue..")
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if sys.stdout.isatty():
+        #ANSI clear + cursor home, no subprocess needed
+        sys.stdout.write("\033[2J\033[H")
+        sys.stdout.flush()
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+def _prompt(message: str, lower: bool = False) -> str:
+    """Read a line of input, stripped and optionally lowercased."""
+    response = input(message).strip()
+    return response.lower() if lower else response
+
+def _pause_return():
+    """Wait for the user before going back to the main menu."""
+    input("\nPress Enter to return to the main menu.")
+
+def _to_float(text: str) -> Optional[float]:
+    """Parse a plain decimal number, or return None instead of raising."""
+    text = text.strip()
+    return float(text) if _NUMBER_RE.match(text) else None
+
+def _user_key(name: str) -> str:
+    """Normalize a user name into the key used for the users dict."""
+    return sys.intern(name.strip().casefold())
+
+def _get_or_create_user(users: Dict[str, "User"], name: str) -> "User":
+    """
+    Return the profile stored under name, prompting for the details
+    of a new profile if there is none. Raises ValueError on invalid details.
+    """
+    key = _user_key(name)
+    user = users.get(key)
+    if user is None:
+        weight = _to_float(_prompt("Enter weight (kg): "))
+        if weight is None or weight <= 0:
+            raise ValueError("Weight must be a positive number.")
+        height = _to_float(_prompt("Enter height (cm): "))
+        if height is None or height <= 0:
+            raise ValueError("Height must be a positive number.")
+        age = int(_prompt("Enter age: "))
+        fitness_level = _prompt("Enter fitness level (beginner/intermediate/advanced): ")
+        user = users[key] = User(name, weight, height, age, fitness_level)
+    return user
 
 def log_workout(workout, user, exercise_name, muscle_group, duration, intensity, calories_per_min, heart_rate):
     """
@@ -246,46 +532,39 @@ def log_workout(workout, user, exercise_name, muscle_group, duration, intensity,
         print(f"Invalid input: {e}")
         return
 
-    #Load the exercise database
+    #Load the exercise name index
     try:
-        with open('exercise_database.json', 'r') as file:
-            data = json.load(file)
+        index = _exercise_index()
     except (FileNotFoundError, json.JSONDecodeError):
         print("Error: Could not load exercise database.")
         return
 
-    #Match exercise
-    found = False
-    for group, exercises in data.items():
-        for e in exercises:
-            if e['name'].lower() == exercise_name.lower():  # Case-insensitive match
-                exercise = Exercise(
-                    name=e['name'],
-                    muscle_group=group,
-                    duration=duration,
-                    calories_burned_per_minute=calories_per_min,
-                    intensity=intensity,
-                    equipment_needed=e.get('equipment_needed', [])
-                )
-                workout.add_exercise(exercise, user.weight, int(heart_rate) if heart_rate else None)
-                print(f"=== Added {e['name']} ({duration} min) to the workout ===")
-                found = True
-                break
-        if found:
-            break
-
-    #In case an exercise isn't in file, and user still wants to log
-    if not found:
+    #Match exercise (case-insensitive)
+    match = index.get(exercise_name.strip().casefold())
+    if match:
+        group, e = match
+        exercise = Exercise(
+            name=e['name'],
+            muscle_group=group,
+            duration=duration,
+            calories_burned_per_minute=calories_per_min,
+            intensity=intensity,
+            equipment_needed=list(e.get('equipment_needed') or ())
+        )
+        workout.add_exercise(exercise, user.weight, int(heart_rate) if heart_rate else None)
+        print(f"=== Added {e['name']} ({duration} min) to the workout ===")
+    else:
+        #In case an exercise isn't in file, and user still wants to log
         print(f"\nExercise '{exercise_name}' not found.")
         #Prompt
-        add_custom = input("\nWould you like to log this as a custom exercise? (yes/no): ").strip().lower()
+        add_custom = _prompt("\nWould you like to log this as a custom exercise? (yes/no): ", lower=True)
         if add_custom == 'yes':
             print("\n=== Logging custom exercise ===")
             try:
-                muscle_group = input("Enter muscle group: ").strip()
-                duration = int(input("Enter duration (minutes): ").strip())
-                calories_per_min = float(input("Enter calories burned per minute: ").strip())
-                intensity = input("Enter intensity (low/medium/high): ").strip()
+                muscle_group = _prompt("Enter muscle group: ")
+                duration = int(_prompt("Enter duration (minutes): "))
+                calories_per_min = float(_prompt("Enter calories burned per minute: "))
+                intensity = _prompt("Enter intensity (low/medium/high): ")
                 custom_exercise = Exercise(
                     name=exercise_name,
                     muscle_group=muscle_group,
@@ -302,8 +581,7 @@ def workout_suggester(muscle_group: str, user_weight: float, fitness_level: str
                      available_equipment: List[str] = None) -> List[Dict]:
     """Suggest personalized exercises based on user's characteristics and equipment."""
     try:
-        with open('exercise_database.json', 'r') as file:
-            data = json.load(file)
+        data = _load_db()
     except (FileNotFoundError, json.JSONDecodeError) as e:
         logging.error(f"Error loading exercise database: {e}")
         return []
@@ -313,9 +591,12 @@ def workout_suggester(muscle_group: str, user_weight: float, fitness_level: str
         logging.warning(f"No exercises found for muscle group: {muscle_group}")
         return []
 
+    records, cpms, equipment_sets = _calorie_columns()[muscle_group]
+    rows = zip(records, cpms)
     if available_equipment:
-        exercises = [e for e in exercises if not e.get('equipment_needed') or 
-                    all(eq in available_equipment for eq in e['equipment_needed'])]
+        available = frozenset(available_equipment)
+        rows = [(e, cpm) for e, cpm, needed in zip(records, cpms, equipment_sets)
+                if needed <= available]
 
     difficulty_multipliers = {
         "beginner": 0.8,
@@ -324,23 +605,228 @@ def workout_suggester(muscle_group: str, user_weight: float, fitness_level: str
     }
     multiplier = difficulty_multipliers.get(fitness_level, 1.0)
 
-    suggestions = []
-    for e in exercises:
-        cal_adjusted = e['calories_burned_per_minute'] * (user_weight / 70) * multiplier
-        suggestion = {
+    #Scale the whole calorie column by one factor; the column is already ranked,
+    #so the suggestions come out in order without a sort per call
+    scale = (user_weight / 70) * multiplier
+    suggestions = [
+        {
             'name': e['name'],
             'duration': e['duration'],
-            'calories_per_minute': round(cal_adjusted, 2),
+            'calories_per_minute': round(cpm * scale, 2),
             'intensity': e.get('intensity', 'medium'),
-            'equipment': e.get('equipment_needed', [])
+            'equipment': list(e.get('equipment_needed') or ())
         }
-        suggestions.append(suggestion)
+        for e, cpm in rows
+    ]
 
-    return sorted(suggestions, key=lambda x: x['calories_per_minute'], reverse=True)
+    return suggestions
+
+def _atomic_pickle_dump(obj, path: str):
+    """
+    Pickle obj to a temporary file next to path, then swap it into place,
+    so a crash mid-write never leaves a truncated file behind.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+#Bumped whenever the layout written by save_state changes
+_STATE_VERSION = 1
+
+def save_state(users: Dict[str, "User"], path: str = 'fitness_tracker_state.pkl'):
+    """
+    Save all user profiles and their workout history to disk.
+    Only plain data is written, so the file loads no matter how the program was started.
+    """
+    _atomic_pickle_dump({
+        "version": _STATE_VERSION,
+        "users": {key: user.to_dict() for key, user in users.items()}
+    }, path)
+
+def load_state(path: str = 'fitness_tracker_state.pkl') -> Dict[str, "User"]:
+    """
+    Load user profiles saved by save_state, or an empty dict if there are none.
+    A file that can't be loaded is moved aside to a timestamped .bak copy so
+    the next save doesn't overwrite it.
+    """
+    try:
+        with open(path, 'rb') as file:
+            state = pickle.load(file)
+        if state["version"] != _STATE_VERSION:
+            raise ValueError(f"unsupported state version {state['version']!r}")
+        return {key: User.from_dict(data) for key, data in state["users"].items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        backup_path = f"{path}.{datetime.now():%Y%m%d-%H%M%S-%f}.bak"
+        os.replace(path, backup_path)
+        logging.error(f"Error loading saved state: {e}; moved it to {backup_path}")
+        print(f"\033[1;31mCould not load saved data; it was kept in {backup_path}.\033[0m")
+        return {}
+
+def _menu_suggestions(users: Dict[str, User]):
+    """Option 1: show personalized workout suggestions."""
+    clear_screen()
+    print("== Personalized Workout Suggestions ==")
+    user = users.get(_user_key(_prompt("Enter your name (or type 'back' to return): ")))
+    if user is None:
+        print("\033[1;31mUser not found. Please create a profile first.\033[0m")
+        _pause_return()
+        return
+        
+    muscle_group = _prompt("Enter muscle group (Legs/Upper Body/Core, or type 'back' to return): ")
+    if muscle_group.lower() == 'back':
+        return
+    
+    equipment = _prompt("Available equipment (comma-separated, or press enter for none): ")
+    available_equipment = [e.strip() for e in equipment.split(',')] if equipment else None
+
+    #UI Upgrade: Animation, shown only while the suggester is still working
+    print("Fetching workout suggestions", end="", flush=True)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(workout_suggester, muscle_group, user.weight,
+                                 user.fitness_level, available_equipment)
+        while wait([future], timeout=0.25).not_done:
+            print(".", end="", flush=True)
+    print("\n")
+
+    suggestions = future.result()
+    clear_screen()
+
+    if suggestions:
+        lines = []
+        for s in suggestions:
+            lines.append(f"\n{s['name']}:")
+            lines.append(f"Duration: {s['duration']} min")
+            lines.append(f"Calories/min: {s['calories_per_minute']}")
+            lines.append(f"Intensity: {s['intensity']}")
+            if s['equipment']:
+                lines.append(f"Equipment: {', '.join(s['equipment'])}")
+        sys.stdout.write("\n".join(lines) + "\n")
+    else:
+        print("\033[1;31mNo suggestions available for the given criteria.\033[0m")
+
+    _pause_return()
+
+def _menu_log_workout(users: Dict[str, User]):
+    """Option 2: log a workout, creating the profile if needed."""
+    clear_screen()
+    print("== Log a Workout ==")
+    user_name = _prompt("Enter your name (or type 'back' to return): ")
+    if user_name.lower() == 'back':
+        return
+    
+    if not user_name:
+        print("\033[1;31mName cannot be empty.\033[0m")
+        _pause_return()
+        return
+
+    try:
+        user = _get_or_create_user(users, user_name)
+    except ValueError as e:
+        print(f"\033[1;31mInvalid input: {e}\033[0m")
+        _pause_return()
+        return
+
+    workout = Workout()
+    print("\n=== Logging workout (type 'done' when finished) ===")
+
+    while True:
+        exercise_name = _prompt("\nEnter exercise name (or 'done' to finish): ")
+        exercise_key = exercise_name.lower()
+        if exercise_key == 'done':
+            break
+        if exercise_key == 'back':
+            continue
+
+        muscle_group = _prompt("Enter muscle group (Legs/Upper Body/Core): ")
+        duration = _prompt("Enter duration (minutes): ")
+        intensity = _prompt("Enter intensity (low/medium/high): ")
+        calories_per_min = _prompt("Enter calories burned per minute: ")
+        heart_rate = _prompt("Heart rate (optional): ")
+
+        #Pass inputs to log_workout
+        log_workout(workout, user, exercise_name, muscle_group, duration, intensity, calories_per_min, heart_rate)
+
+    workout.notes = _prompt("\nAny notes for this workout? ")
+    user.add_workout(workout)
+    save_state(users)
+    print("\033[1;32mWorkout logged successfully!\033[0m")
+    _pause_return()
+
+def _menu_view_history(users: Dict[str, User]):
+    """Option 3: show a user's workout history."""
+    clear_screen()
+    print("== View Workout History ==")
+    user_key = _user_key(_prompt("Enter your name (or type 'back' to return): "))
+    if user_key == 'back':
+        return
+    if user_key in users:
+        detailed = _prompt("Show detailed view? (y/n): ", lower=True) == 'y'
+        users[user_key].view_workouts(detailed)
+    else:
+        print("\033[1;31mUser not found.\033[0m")
+    _pause_return()
+
+def _menu_set_goal(users: Dict[str, User]):
+    """Option 4: set a fitness goal."""
+    clear_screen()
+    print("== Set Fitness Goals ==")
+    user_key = _user_key(_prompt("Enter your name (or type 'back' to return): "))
+    if user_key == 'back':
+        return
+    if user_key not in users:
+        print("\033[1;31mUser not found.\033[0m")
+        _pause_return()
+        return
+
+    goal_type = _prompt("Goal type (calories/workouts): ")
+    target = float(_prompt("Target value: "))
+    days = int(_prompt("Days to achieve goal: "))
+    deadline = datetime.now().date() + timedelta(days=days)
+
+    users[user_key].set_goal(goal_type, target, deadline)
+    save_state(users)
+    print("\033[1;32mGoal set successfully!\033[0m")
+    _pause_return()
+
+def _menu_view_progress(users: Dict[str, User]):
+    """Option 5: show a user's progress report."""
+    clear_screen()
+    print("== View Progress ==")
+    user_key = _user_key(_prompt("Enter your name (or type 'back' to return): "))
+    if user_key == 'back':
+        return
+    if user_key in users:
+        users[user_key].view_progress()
+    else:
+        print("\033[1;31mUser not found.\033[0m")
+    _pause_return()
+
+#Menu choice -> handler; 'q' is handled in main since it ends the loop
+_MENU_ACTIONS = {
+    '1': _menu_suggestions,
+    '2': _menu_log_workout,
+    '3': _menu_view_history,
+    '4': _menu_set_goal,
+    '5': _menu_view_progress,
+}
 
 def main():
+    global _DB_PICKLE_CACHE
     
-    users = {}
+    configure_logging()
+    _DB_PICKLE_CACHE = True
+    users = load_state()
+
+    #Windows consoles only honour ANSI escape codes after a shell call
+    if os.name == 'nt':
+        os.system('')
 
 
     #WELCOME SCREEN
@@ -369,146 +855,15 @@ def main():
             print("5: View progress")
             print("q: Quit")
             
-            choice = input("\033[1;34mChoose an option (1-5, q to quit): \033[0m").strip().lower()
-
-            if choice == '1':  #WORKOUT SUGGESTIONS
-                clear_screen()
-                print("== Personalized Workout Suggestions ==")
-                user_name = input("Enter your name (or type 'back' to return): ").strip()
-                if not user_name or user_name not in users:
-                    print("\033[1;31mUser not found. Please create a profile first.\033[0m")
-                    input("\nPress Enter to return to the main menu.")
-                    continue
-                    
-                user = users[user_name]
-                muscle_group = input("Enter muscle group (Legs/Upper Body/Core, or type 'back' to return): ").strip()
-                if muscle_group.lower() == 'back':
-                    continue
-                
-                equipment = input("Available equipment (comma-separated, or press enter for none): ").strip()
-                available_equipment = [e.strip() for e in equipment.split(',')] if equipment else None
-
-                #UI Upgrade: Animation
-                print("Fetching workout suggestions", end="", flush=True)
-                for _ in range(3):
-                    time.sleep(0.5)
-                    print(".", end="", flush=True)
-                print("\n")
-
-                suggestions = workout_suggester(muscle_group, user.weight, user.fitness_level, available_equipment)
-                clear_screen()
-
-                if suggestions:
-                    for s in suggestions:
-                        print(f"\n{s['name']}:")
-                        print(f"Duration: {s['duration']} min")
-                        print(f"Calories/min: {s['calories_per_minute']}")
-                        print(f"Intensity: {s['intensity']}")
-                        if s['equipment']:
-                            print(f"Equipment: {', '.join(s['equipment'])}")
-                else:
-                    print("\033[1;31mNo suggestions available for the given criteria.\033[0m")
-
-                input("\nPress Enter to return to the main menu.")
-
-            elif choice == '2':  #LOGGING A WORKOUT
-                clear_screen()
-                print("== Log a Workout ==")
-                user_name = input("Enter your name (or type 'back' to return): ").strip()
-                if user_name.lower() == 'back':
-                    continue
-                
-                if not user_name:
-                    print("\033[1;31mName cannot be empty.\033[0m")
-                    input("\nPress Enter to return to the main menu.")
-                    continue
-
-                if user_name not in users:
-                    try:
-                        weight = float(input("Enter weight (kg): ").strip())
-                        height = float(input("Enter height (cm): ").strip())
-                        age = int(input("Enter age: ").strip())
-                        fitness_level = input("Enter fitness level (beginner/intermediate/advanced): ").strip()
-                        users[user_name] = User(user_name, weight, height, age, fitness_level)
-                    except ValueError as e:
-                        print(f"\033[1;31mInvalid input: {e}\033[0m")
-                        input("\nPress Enter to return to the main menu.")
-                        continue
-
-                user = users[user_name]
-                workout = Workout()
-                print("\n=== Logging workout (type 'done' when finished) ===")
-
-                while True:
-                    exercise_name = input("\nEnter exercise name (or 'done' to finish): ").strip()
-                    if exercise_name.lower() == 'done':
-                        break
-                    if exercise_name.lower() == 'back':
-                        continue
-
-                    muscle_group = input("Enter muscle group (Legs/Upper Body/Core): ").strip()
-                    duration = input("Enter duration (minutes): ").strip()
-                    intensity = input("Enter intensity (low/medium/high): ").strip()
-                    calories_per_min = input("Enter calories burned per minute: ").strip()
-                    heart_rate = input("Heart rate (optional): ").strip()
-
-                    #Pass inputs to log_workout
-                    log_workout(workout, user, exercise_name, muscle_group, duration, intensity, calories_per_min, heart_rate)
-
-                workout.notes = input("\nAny notes for this workout? ").strip()
-                user.add_workout(workout)
-                print("\033[1;32mWorkout logged successfully!\033[0m")
-                input("\nPress Enter to return to the main menu.")
-
-
-            elif choice == '3':  #VIEW WORKOUT HISTORY
-                clear_screen()
-                print("== View Workout History ==")
-                user_name = input("Enter your name (or type 'back' to return): ").strip()
-                if user_name.lower() == 'back':
-                    continue
-                if user_name in users:
-                    detailed = input("Show detailed view? (y/n): ").strip().lower() == 'y'
-                    users[user_name].view_workouts(detailed)
-                else:
-                    print("\033[1;31mUser not found.\033[0m")
-                input("\nPress Enter to return to the main menu.")
-
-            elif choice == '4':  #SET FITNESS GOALS
-                clear_screen()
-                print("== Set Fitness Goals ==")
-                user_name = input("Enter your name (or type 'back' to return): ").strip()
-                if user_name.lower() == 'back':
-                    continue
-                if user_name not in users:
-                    print("\033[1;31mUser not found.\033[0m")
-                    input("\nPress Enter to return to the main menu.")
-                    continue
-
-                goal_type = input("Goal type (calories/workouts): ").strip()
-                target = float(input("Target value: ").strip())
-                days = int(input("Days to achieve goal: ").strip())
-                deadline = datetime.now().date() + timedelta(days=days)
-
-                users[user_name].set_goal(goal_type, target, deadline)
-                print("\033[1;32mGoal set successfully!\033[0m")
-                input("\nPress Enter to return to the main menu.")
-
-            elif choice == '5':  # VIEW PROGRESS
-                clear_screen()
-                print("== View Progress ==")
-                user_name = input("Enter your name (or type 'back' to return): ").strip()
-                if user_name.lower() == 'back':
-                    continue
-                if user_name in users:
-                    users[user_name].view_progress()
-                else:
-                    print("\033[1;31mUser not found.\033[0m")
-                input("\nPress Enter to return to the main menu.")
+            choice = _prompt("\033[1;34mChoose an option (1-5, q to quit): \033[0m", lower=True)
 
+            action = _MENU_ACTIONS.get(choice)
+            if action is not None:
+                action(users)
             elif choice == 'q':  #Quit the app
-                confirm = input("Are you sure you want to quit? (y/n): ").strip().lower()
+                confirm = _prompt("Are you sure you want to quit? (y/n): ", lower=True)
                 if confirm == 'y':
+                    save_state(users)
                     clear_screen()
                     print("\033[1;32mThank you for using Fitness Tracker Pro!\033[0m")
                     break
@@ -520,7 +875,7 @@ def main():
 
         except Exception as e:
             print(f"\033[1;31mAn error occurred: {e}\033[0m")
-            input("\nPress Enter to return to the main menu.")
+            _pause_return()
 
 if __name__ == "__main__":
     main()
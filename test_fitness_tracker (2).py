@@ -1,8 +1,15 @@
 
 import unittest
 import datetime
+import io
 import json
-from fitness_tracker import Exercise, Workout, User, workout_suggester
+import os
+import pickle
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+import fitness_tracker
+from fitness_tracker import Exercise, Workout, User, workout_suggester, save_state, load_state
 
 
 
@@ -37,6 +44,14 @@ class TestExercise(unittest.TestCase):
         with self.assertRaises(ValueError):
             Exercise("Push-ups", "Upper Body", 10, 5.0, intensity="invalid")
 
+    def test_non_string_intensity_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            Exercise("Push-ups", "Upper Body", 10, 5.0, intensity=None)
+
+    def test_missing_muscle_group_is_accepted(self):
+        exercise = Exercise("Push-ups", None, 10, 5.0)
+        self.assertIsNone(exercise.muscle_group)
+
     def test_calculate_calories_burned(self):
         # Test with just weight
         calories = self.exercise.calculate_calories_burned(70)
@@ -72,6 +87,15 @@ class TestWorkout(unittest.TestCase):
         self.assertEqual(self.workout._total_calories_burned, 60.0)
         self.assertEqual(self.workout.heart_rate_log, [150])
 
+    def test_add_exercises(self):
+        squats = Exercise("Squats", "Legs", 12, 9.0, "high")
+        self.workout.add_exercises([self.exercise, squats], 70)
+
+        self.assertEqual(len(self.workout.exercises), 2)
+        self.assertEqual(self.workout._total_duration, 22)
+        self.assertAlmostEqual(self.workout._total_calories_burned, 50.0 + 129.6)
+        self.assertEqual(self.workout.heart_rate_log, [])
+
     def test_get_workout_summary(self):
         self.workout.add_exercise(self.exercise, 70, heart_rate=150)
         summary = self.workout.get_workout_summary()
@@ -83,6 +107,30 @@ class TestWorkout(unittest.TestCase):
         self.assertEqual(summary["equipment_used"], ["mat"])
         self.assertEqual(summary["average_heart_rate"], 150)
 
+    def test_workout_summary_updates_after_changes(self):
+        self.workout.add_exercise(self.exercise, 70)
+        self.assertEqual(self.workout.get_workout_summary()["exercise_count"], 1)
+
+        self.workout.add_exercise(Exercise("Squats", "Legs", 12, 9.0, "high"), 70, heart_rate=130)
+        self.workout.notes = "Leg day"
+        summary = self.workout.get_workout_summary()
+
+        self.assertEqual(summary["exercise_count"], 2)
+        self.assertEqual(summary["total_duration"], 22)
+        self.assertEqual(sorted(summary["muscle_groups"]), ["Legs", "Upper Body"])
+        self.assertEqual(summary["average_heart_rate"], 130)
+        self.assertEqual(summary["notes"], "Leg day")
+
+    def test_workout_summary_is_independent_copy(self):
+        self.workout.add_exercise(self.exercise, 70)
+        summary = self.workout.get_workout_summary()
+        summary["muscle_groups"].append("Legs")
+        summary["notes"] = "changed"
+
+        fresh = self.workout.get_workout_summary()
+        self.assertEqual(fresh["muscle_groups"], ["Upper Body"])
+        self.assertEqual(fresh["notes"], "")
+
 class TestUser(unittest.TestCase):
     def setUp(self):
         self.user = User(
@@ -123,6 +171,38 @@ class TestUser(unittest.TestCase):
         self.assertEqual(progress["calories"], 50.0)
         self.assertEqual(progress["duration"], 10)
 
+    def test_add_workout_fractional_duration(self):
+        self.workout.add_exercise(Exercise("Plank", "Core", 2.5, 4.0), self.user.weight)
+        self.user.add_workout(self.workout)
+
+        self.assertEqual(len(self.user.workouts), 1)
+        self.assertEqual(self.user.progress_history[0]["duration"], 2.5)
+
+    def test_progress_durations_keep_their_form(self):
+        self.workout.add_exercise(Exercise("Push-ups", "Upper Body", 10, 5.0), self.user.weight)
+        self.user.add_workout(self.workout)
+        other = Workout()
+        other.add_exercise(Exercise("Plank", "Core", 7 / 3, 4.0), self.user.weight)
+        self.user.add_workout(other)
+
+        self.assertIsInstance(self.user.progress_history[0]["duration"], int)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.user.view_progress()
+        self.assertIn("Workout 1: 10 minutes", output.getvalue())
+        self.assertIn(f"Workout 2: {7 / 3} minutes", output.getvalue())
+
+    def test_view_workouts_totals_follow_later_exercises(self):
+        self.workout.add_exercise(Exercise("Push-ups", "Upper Body", 10, 5.0), self.user.weight)
+        self.user.add_workout(self.workout)
+        self.workout.add_exercise(Exercise("Squats", "Lower Body", 5, 5.0), self.user.weight)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.user.view_workouts()
+        self.assertIn("Total Duration: 15 minutes", output.getvalue())
+        self.assertIn("Total Calories: 75.00", output.getvalue())
+
     def test_set_goal(self):
         deadline = datetime.date.today() + datetime.timedelta(days=30)
         self.user.set_goal("calories", 1000, deadline)
@@ -171,6 +251,13 @@ class TestWorkoutSuggester(unittest.TestCase):
         
         self.assertEqual(len(suggestions), 0)
 
+    def test_workout_suggester_returns_independent_equipment(self):
+        first = workout_suggester("Upper Body", 70)
+        first[0]["equipment"].append("towel")
+
+        second = workout_suggester("Upper Body", 70)
+        self.assertNotIn("towel", second[0]["equipment"])
+
     def tearDown(self):
         import os
         # Clean up the temporary test file
@@ -179,5 +266,108 @@ class TestWorkoutSuggester(unittest.TestCase):
         except:
             pass
 
+class TestState(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, 'state.pkl')
+
+    def test_save_and_load_state(self):
+        user = User("John", 70)
+        workout = Workout()
+        workout.add_exercise(Exercise("Push-ups", "Upper Body", 10, 5.0), user.weight)
+        user.add_workout(workout)
+        save_state({"John": user}, self.path)
+
+        users = load_state(self.path)
+        self.assertEqual(list(users), ["John"])
+        self.assertEqual(users["John"].weight, 70)
+        self.assertEqual(len(users["John"].workouts), 1)
+        self.assertEqual(users["John"].progress_history[0]["calories"], 50.0)
+
+    def test_saved_state_is_plain_data(self):
+        user = User("John", 70)
+        workout = Workout()
+        workout.add_exercise(Exercise("Squats", "Legs", 10, 5.0, equipment_needed=["mat"]), user.weight, 150)
+        workout.notes = "felt good"
+        user.add_workout(workout)
+        user.set_goal("workouts", 5, datetime.date.today())
+        save_state({"john": user}, self.path)
+
+        #Only builtins and datetime may appear, so loading never depends on how the program was started
+        class PlainUnpickler(pickle.Unpickler):
+            def find_class(self, module, name):
+                if module != 'datetime':
+                    raise pickle.UnpicklingError(f"{module}.{name}")
+                return super().find_class(module, name)
+
+        with open(self.path, 'rb') as f:
+            PlainUnpickler(f).load()
+
+        restored = load_state(self.path)["john"]
+        summary = restored.workouts[0].get_workout_summary()
+        self.assertEqual(summary, workout.get_workout_summary())
+        self.assertEqual(restored.workouts[0].date, workout.date)
+        self.assertEqual(restored.goals, user.goals)
+        self.assertEqual(restored.progress_history, user.progress_history)
+
+    def test_load_state_missing_file(self):
+        self.assertEqual(load_state(self.path), {})
+
+    def test_load_state_keeps_unreadable_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a pickle')
+
+        self.assertEqual(load_state(self.path), {})
+        self.assertFalse(os.path.exists(self.path))
+        backups = [name for name in os.listdir(os.path.dirname(self.path)) if name.endswith('.bak')]
+        self.assertEqual(len(backups), 1)
+        with open(os.path.join(os.path.dirname(self.path), backups[0]), 'rb') as f:
+            self.assertEqual(f.read(), b'not a pickle')
+
+class TestDatabaseCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, 'db.json')
+        self.cache_path = os.path.join(temp_dir.name, 'db.pkl')
+        patcher = mock.patch.object(fitness_tracker, '_DB_PICKLE_CACHE', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        fitness_tracker._load_db.cache_clear()
+        self.addCleanup(fitness_tracker._load_db.cache_clear)
+
+    def write_db(self, data, mtime):
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_sidecar_ignored_after_older_json_restored(self):
+        self.write_db({"Core": []}, 2000000000)
+        self.assertEqual(fitness_tracker._load_db(self.path), {"Core": []})
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        #An older file put back in place must not be shadowed by the newer sidecar
+        self.write_db({"Legs": [1]}, 1000000000)
+        fitness_tracker._load_db.cache_clear()
+        self.assertEqual(fitness_tracker._load_db(self.path), {"Legs": [1]})
+
+    def test_unreadable_sidecar_is_rewritten(self):
+        self.write_db({"Core": []}, 2000000000)
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'\x80\x05X\x02\x00\x00\x00\xff\xfe.')
+
+        self.assertEqual(fitness_tracker._load_db(self.path), {"Core": []})
+        with open(self.cache_path, 'rb') as f:
+            self.assertEqual(pickle.load(f)['data'], {"Core": []})
+
+    def test_no_sidecar_when_disabled(self):
+        patcher = mock.patch.object(fitness_tracker, '_DB_PICKLE_CACHE', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.write_db({"Core": []}, 2000000000)
+        self.assertEqual(fitness_tracker._load_db(self.path), {"Core": []})
+        self.assertFalse(os.path.exists(self.cache_path))
+
 if __name__ == '__main__':
     unittest.main()